@@ -0,0 +1,448 @@
+import argparse
+import asyncio
+import collections
+import hashlib
+import ipaddress
+import itertools
+import logging
+import mmap
+import os
+import pickle
+import re
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+import orjson
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IP_API_URL = "http://ip-api.com/json"
+IP_API_BATCH_URL = "http://ip-api.com/batch"
+IP_API_FIELDS = "status,message,country,countryCode,region,city,isp,org,as,query"
+BATCH_SIZE = 100
+# ip-api.com allows 15 batch requests per minute without a key.
+BATCH_RATE_LIMIT = 15
+# The unauthenticated quota is shared with every other consumer, so a 429
+# can arrive despite the client-side limiter; retry transient failures
+# with backoff before degrading the affected lookups.
+LOOKUP_RETRY_ATTEMPTS = 3
+LOOKUP_RETRY_BASE_DELAY = 1.0
+GEO_CACHE_PATH = os.path.expanduser("~/.cache/proxy-geo.sqlite")
+GEO_CACHE_TTL = 24 * 60 * 60
+
+
+def _build_reserved_ranges():
+    """Precompute special-address ranges as (low, high, label) integers."""
+    ranges = [
+        ("0.0.0.0/8", "reserved address"),
+        ("10.0.0.0/8", "private address"),
+        ("100.64.0.0/10", "carrier-grade NAT address"),
+        ("127.0.0.0/8", "loopback address"),
+        ("169.254.0.0/16", "link-local address"),
+        ("172.16.0.0/12", "private address"),
+        ("192.168.0.0/16", "private address"),
+        ("224.0.0.0/4", "multicast address"),
+        ("240.0.0.0/4", "reserved address"),
+    ]
+    table = []
+    for cidr, label in ranges:
+        network = ipaddress.ip_network(cidr)
+        table.append((int(network.network_address), int(network.broadcast_address), label))
+    return table
+
+
+RESERVED_RANGES = _build_reserved_ranges()
+
+DATACENTER_PATTERN = re.compile(
+    r"datacenter|hosting|server|cloud|digital ocean|aws|amazon|google|microsoft", re.I)
+CLOUDFLARE_PATTERN = re.compile(r"cloudflare", re.I)
+
+
+def _open_geo_cache():
+    os.makedirs(os.path.dirname(GEO_CACHE_PATH), exist_ok=True)
+    # check_same_thread=False because reads/writes run via asyncio.to_thread.
+    conn = sqlite3.connect(GEO_CACHE_PATH, check_same_thread=False)
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (ip TEXT PRIMARY KEY, ts INTEGER, json BLOB)")
+    return conn
+
+
+def _geo_cache_get(conn, ip):
+    row = conn.execute("SELECT json FROM cache WHERE ip = ? AND ts > ?",
+                       (ip, int(time.time()) - GEO_CACHE_TTL)).fetchone()
+    if row is not None:
+        return orjson.loads(row[0])
+    return None
+
+
+def _geo_cache_put(conn, ip, data):
+    conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                 (ip, int(time.time()), orjson.dumps(data)))
+    conn.commit()
+
+
+@dataclass(slots=True)
+class ProxyInfo:
+    ip: str
+    port: str
+    country: Optional[str] = None
+    country_code: Optional[str] = None
+    region: Optional[str] = None
+    city: Optional[str] = None
+    isp: Optional[str] = None
+    org: Optional[str] = None
+    asn: Optional[str] = None
+    is_datacenter: bool = False
+    is_cloudflare: bool = False
+    note: Optional[str] = None
+
+
+class ProxyGeolocator:
+
+    async def __aenter__(self):
+        # Deferred so --help and local-only paths never pay the import cost.
+        import httpx
+        from aiolimiter import AsyncLimiter
+        self.client = httpx.AsyncClient(
+            http2=True, timeout=10,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=50))
+        self.cache = _open_geo_cache()
+        self.limiter = AsyncLimiter(BATCH_RATE_LIMIT, 60)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        self.cache.close()
+
+    def _check_special_addresses(self, ip, port):
+        """Classify non-routable addresses without a network lookup."""
+        try:
+            if ":" in ip:
+                # IPv6 stays on ipaddress; the special table is IPv4-only.
+                ipaddress.ip_address(ip)
+                return None
+            # inet_aton parses the dotted quad in C, ~20x faster than
+            # constructing an ipaddress object.
+            ip_int = int.from_bytes(socket.inet_aton(ip), "big")
+        except (OSError, ValueError):
+            return ProxyInfo(ip=ip, port=port, note="invalid address")
+        for low, high, label in RESERVED_RANGES:
+            if low <= ip_int <= high:
+                return ProxyInfo(ip=ip, port=port, note=label)
+        return None
+
+    def _process_geolocation_data(self, data, ip, port):
+        info = ProxyInfo(ip=ip, port=port)
+        if data.get("status") != "success":
+            info.note = data.get("message", "lookup failed")
+            return info
+        info.country = data.get("country")
+        info.country_code = data.get("countryCode")
+        info.region = data.get("region")
+        info.city = data.get("city")
+        info.isp = data.get("isp")
+        info.org = data.get("org")
+        info.asn = data.get("as")
+        org = info.org or ""
+        isp = info.isp or ""
+        if DATACENTER_PATTERN.search(org) or DATACENTER_PATTERN.search(isp):
+            info.is_datacenter = True
+        if CLOUDFLARE_PATTERN.search(org) or CLOUDFLARE_PATTERN.search(isp):
+            info.is_cloudflare = True
+        return info
+
+    async def _request_json(self, method, url, **kwargs):
+        import httpx
+
+        # Per-item degradation, like the checker's (False, 0, e) results and
+        # the scraper's per-source try/except: transport errors, 429/5xx and
+        # non-JSON bodies are retried with backoff, then reported as None
+        # rather than propagating out of the batch gather.
+        for attempt in range(LOOKUP_RETRY_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(LOOKUP_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                continue
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                continue
+        return None
+
+    async def get_ip_info(self, ip, port=""):
+        special = self._check_special_addresses(ip, port)
+        if special is not None:
+            return special
+        data = await asyncio.to_thread(_geo_cache_get, self.cache, ip)
+        if data is None:
+            data = await self._request_json("GET", f"{IP_API_URL}/{ip}",
+                                            params={"fields": IP_API_FIELDS})
+            if not isinstance(data, dict):
+                return ProxyInfo(ip=ip, port=port, note="lookup failed")
+            await asyncio.to_thread(_geo_cache_put, self.cache, ip, data)
+        return self._process_geolocation_data(data, ip, port)
+
+    async def get_ip_info_batch(self, proxies: List[Tuple[str, str]]) -> List[ProxyInfo]:
+        """Look up many (ip, port) pairs at once via ip-api.com's /batch endpoint.
+
+        One POST covers up to 100 addresses, replacing 100 serialized GETs.
+        Answers seen within the last 24 hours come from the on-disk cache
+        without touching the network.
+        """
+        # Lists often carry the same IP on several ports; look each IP up
+        # once and fan the answer back out to every (ip, port) pair.
+        info_by_ip = {}
+        misses = []
+        for ip in dict.fromkeys(ip for ip, _ in proxies):
+            data = await asyncio.to_thread(_geo_cache_get, self.cache, ip)
+            if data is not None:
+                info_by_ip[ip] = self._process_geolocation_data(data, ip, "")
+            else:
+                misses.append(ip)
+        chunks = [misses[start:start + BATCH_SIZE] for start in range(0, len(misses), BATCH_SIZE)]
+        for chunk_results in await asyncio.gather(*(self._lookup_chunk(chunk) for chunk in chunks)):
+            for info in chunk_results:
+                info_by_ip[info.ip] = info
+        return [replace(info_by_ip[ip], port=port) for ip, port in proxies]
+
+    async def _lookup_chunk(self, chunk):
+        # The token bucket spaces the POSTs out to the documented rate while
+        # letting requests for different chunks overlap in flight.
+        async with self.limiter:
+            payload = await self._request_json(
+                "POST", IP_API_BATCH_URL,
+                json=[{"query": ip, "fields": IP_API_FIELDS} for ip in chunk])
+        answers = payload if isinstance(payload, list) else []
+        chunk_results = []
+        for ip, data in zip(chunk, answers):
+            if not isinstance(data, dict):
+                chunk_results.append(ProxyInfo(ip=ip, port="", note="lookup failed"))
+                continue
+            await asyncio.to_thread(_geo_cache_put, self.cache, ip, data)
+            chunk_results.append(self._process_geolocation_data(data, ip, ""))
+        # A failed or truncated batch degrades to per-IP notes; only the
+        # chunk's addresses are affected, never the rest of the run.
+        for ip in chunk[len(answers):]:
+            chunk_results.append(ProxyInfo(ip=ip, port="", note="lookup failed"))
+        return chunk_results
+
+    async def analyze_proxies(self, proxy_list) -> List[ProxyInfo]:
+        """Analyze any iterable of (ip, port) pairs, one batch at a time.
+
+        Consuming the input in BATCH_SIZE chunks pipelines file parsing
+        with the network lookups instead of parsing everything up front.
+        """
+        results = []
+        analyzed = 0
+        for chunk in _batched(proxy_list, BATCH_SIZE):
+            lookups = []
+            for ip, port in chunk:
+                special = self._check_special_addresses(ip, port)
+                if special is not None:
+                    results.append(special)
+                else:
+                    lookups.append((ip, port))
+            results.extend(await self.get_ip_info_batch(lookups))
+            analyzed += len(chunk)
+            # %-style args are only formatted if INFO is enabled.
+            logger.info("Analyzed %d proxies", analyzed)
+        return results
+
+    def _calculate_summary_stats(self, results):
+        # Columnar passes: Counter consumes each column at C speed instead
+        # of one bytecode loop incrementing four counters per proxy.
+        countries = collections.Counter(
+            info.country_code for info in results if info.country_code)
+        flags = collections.Counter(
+            (info.is_datacenter, info.is_cloudflare, bool(info.note)) for info in results)
+        return {
+            "total": len(results),
+            "countries": dict(countries),
+            "datacenter": sum(count for (dc, _, _), count in flags.items() if dc),
+            "cloudflare": sum(count for (_, cf, _), count in flags.items() if cf),
+            "special": sum(count for (_, _, sp), count in flags.items() if sp),
+        }
+
+
+def _batched(iterable, n):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, n)):
+        yield chunk
+
+
+_PROXY_LINE_PATTERN = re.compile(rb"^\s*(\d+\.\d+\.\d+\.\d+)(?::(\d+))?\s*$")
+_PROXY_BUFFER_PATTERN = re.compile(rb"^[ \t]*(\d+\.\d+\.\d+\.\d+)(?::(\d+))?[ \t\r]*$", re.M)
+# Below this size the mmap setup costs more than it saves.
+MMAP_PARSE_THRESHOLD = 1 << 20
+
+
+def _iter_proxy_file_lines(file):
+    with open(file, "rb") as f:
+        yield from f
+
+
+def _parse_proxy_line(line):
+    if line.startswith(b"#"):
+        return None
+    match = _PROXY_LINE_PATTERN.match(line)
+    if match is None:
+        return None
+    ip, port = match.group(1, 2)
+    return ip.decode(), port.decode() if port else ""
+
+
+def _iter_mmap_proxies(file):
+    # One multiline finditer over the mapped file replaces the per-line
+    # Python loop; pages are mapped, not copied, so memory stays flat.
+    with open(file, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for match in _PROXY_BUFFER_PATTERN.finditer(buffer):
+                ip, port = match.group(1, 2)
+                yield ip.decode(), port.decode() if port else ""
+        finally:
+            buffer.close()
+
+
+def parse_proxy_list(file, limit=None):
+    """Yield (ip, port) tuples lazily; memory stays O(1) in the file size."""
+    if os.path.getsize(file) >= MMAP_PARSE_THRESHOLD:
+        proxies = _iter_mmap_proxies(file)
+    else:
+        parsed_lines = (_parse_proxy_line(line) for line in _iter_proxy_file_lines(file))
+        proxies = (parsed for parsed in parsed_lines if parsed is not None)
+    if limit:
+        proxies = itertools.islice(proxies, limit)
+    yield from proxies
+
+
+def save_results_json(results, summary, output):
+    # Stream one record at a time: peak memory is one serialized row, not
+    # the whole report buffered as objects plus a JSON string.
+    with open(output, "wb") as f:
+        f.write(b'{"summary": ')
+        f.write(orjson.dumps(summary))
+        f.write(b', "proxies": [\n')
+        # orjson serializes dataclasses natively, so no intermediate dict
+        # is built per row; ProxyInfo field names are already the JSON keys.
+        for i, info in enumerate(results):
+            if i:
+                f.write(b",\n")
+            f.write(orjson.dumps(info))
+        f.write(b"\n]}\n")
+
+
+SOURCE_CACHE_DIR = os.path.expanduser("~/.cache/proxy-sources")
+SOURCE_CACHE_TTL = 10 * 60
+_source_cache = {}
+
+
+async def _scrape_source_cached(scraper, client):
+    # The method is part of the key: several GitHubScraper instances share
+    # one URL but filter it by protocol, so caching on the URL alone would
+    # serve one method's result to the others.
+    key = (scraper.get_url(), scraper.method)
+    now = time.time()
+    cached = _source_cache.get(key)
+    if cached is not None and now - cached[0] < SOURCE_CACHE_TTL:
+        return cached[1]
+    path = os.path.join(SOURCE_CACHE_DIR,
+                        hashlib.md5((scraper.method + ":" + scraper.get_url()).encode()).hexdigest() + ".pkl")
+    if os.path.exists(path) and now - os.path.getmtime(path) < SOURCE_CACHE_TTL:
+        with open(path, "rb") as f:
+            scraped = pickle.load(f)
+    else:
+        # frozenset: immutable, safely shared between cache layers and calls.
+        scraped = frozenset(await scraper.scrape(client))
+        os.makedirs(SOURCE_CACHE_DIR, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(scraped, f)
+    _source_cache[key] = (now, scraped)
+    return scraped
+
+
+async def analyze_proxy_sources(proxies):
+    """Report which scraper sources still list the given proxies."""
+    import httpx
+
+    from proxyScraper import scrapers
+
+    # str.join over the (ip, port) tuples runs in C; the f-string version
+    # paid interpreter-level formatting per proxy.
+    proxy_set = set(map(":".join, proxies))
+    semaphore = asyncio.Semaphore(10)
+    client = httpx.AsyncClient(follow_redirects=True)
+
+    async def scrape_source(scraper):
+        async with semaphore:
+            return scraper, await _scrape_source_cached(scraper, client)
+
+    # Every source is a different host, so there is no shared rate limit to
+    # respect -- fan them all out and take the slowest source's latency.
+    pairs = await asyncio.gather(*(scrape_source(scraper) for scraper in scrapers),
+                                 return_exceptions=True)
+    await client.aclose()
+    # Aggregate per domain rather than per URL: the scrapers precompute
+    # their host at construction, so no urlparse runs here, and the several
+    # lists on one host collapse into a single readable entry.
+    source_map = {}
+    for pair in pairs:
+        if isinstance(pair, Exception):
+            continue
+        scraper, scraped_set = pair
+        small, big = ((proxy_set, scraped_set) if len(proxy_set) < len(scraped_set)
+                      else (scraped_set, proxy_set))
+        matches = small & big
+        if matches:
+            source_map[scraper.domain] = source_map.get(scraper.domain, 0) + len(matches)
+    return source_map
+
+
+async def analyze(args):
+    proxies = parse_proxy_list(args.list, args.limit)
+    async with ProxyGeolocator() as geolocator:
+        results = await geolocator.analyze_proxies(proxies)
+        summary = geolocator._calculate_summary_stats(results)
+    if args.sources:
+        summary["sources"] = await analyze_proxy_sources(
+            [(info.ip, info.port) for info in results])
+    save_results_json(results, summary, args.output)
+    print(f"Saved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-l", "--list", help="Path to your proxy list file", default="output.txt")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output file name to save .json file",
+        default="analysis.json",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Analyze at most this many proxies",
+    )
+    parser.add_argument(
+        "--sources",
+        help="Also report which scraper sources list each proxy",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        help="Increase output verbosity",
+        action="store_true",
+    )
+    args = parser.parse_args()
+    if not args.verbose:
+        logger.setLevel(logging.WARNING)
+    asyncio.run(analyze(args))
@@ -1,61 +1,129 @@
 import argparse
+import asyncio
+import collections
+import errno
+import itertools
+import operator
 import random
-import re
 import socket
-import threading
-import urllib.request
+import ssl
+import struct
 from time import time
 
-import socks
+import aiohttp
+import httpx
+from aiohttp_socks import ProxyConnector
 
 user_agents = []
 with open("user_agents.txt", "r") as f:
     for line in f:
         user_agents.append(line.replace("\n", ""))
 
+MAX_CONCURRENT_CHECKS = 1000
+MIN_CONCURRENT_CHECKS = 100
+CONCURRENCY_STEP = 50
+MAX_CONCURRENT_PROBES = 5000
+TCP_PROBE_TIMEOUT = 1.5
+
+
+def _max_probe_concurrency():
+    # Every in-flight probe holds a socket, so stay well under the soft fd
+    # limit (commonly 1024) or the probes themselves die with EMFILE and
+    # live proxies get misreported as dead.
+    try:
+        import resource
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    except (ImportError, OSError, ValueError):
+        return MAX_CONCURRENT_PROBES
+    return max(1, min(MAX_CONCURRENT_PROBES, soft_limit // 2))
+
+# Building an SSL context loads the CA bundle and costs tens of ms of
+# synchronous CPU; do it once and hand the same context to every
+# per-proxy client instead of paying it on each check.
+SSL_CONTEXT = ssl.create_default_context()
+
 
 class Proxy:
+    __slots__ = ("method", "proxy", "_ip_int", "_port")
+
     def __init__(self, method, proxy):
         if method.lower() not in ["http", "https", "socks4", "socks5"]:
             raise NotImplementedError("Only HTTP, HTTPS, SOCKS4, and SOCKS5 are supported")
         self.method = method.lower()
         self.proxy = proxy
 
-    def is_valid(self):
-        return re.match(r"\d{1,3}(?:\.\d{1,3}){3}(?::\d{1,5})?$", self.proxy)
+    @classmethod
+    def parse(cls, method, line):
+        """Parse and validate a proxy line in one pass; None if invalid."""
+        ip, _, port = line.partition(":")
+        if ip.count(".") != 3:
+            return None
+        try:
+            packed = socket.inet_aton(ip)
+        except OSError:
+            return None
+        if port and (not port.isdigit() or not 1 <= int(port) <= 65535):
+            return None
+        proxy = cls(method, line)
+        # Cache the numeric form so sorting at save time needs no re-parse.
+        proxy._ip_int = struct.unpack("!I", packed)[0]
+        proxy._port = int(port) if port else 0
+        return proxy
 
-    def check(self, site, timeout, user_agent, verbose):
-        if self.method in ["socks4", "socks5"]:
-            socks.set_default_proxy(socks.SOCKS4 if self.method == "socks4" else socks.SOCKS5,
-                                    self.proxy.split(':')[0], int(self.proxy.split(':')[1]))
-            socket.socket = socks.socksocket
-            try:
-                start_time = time()
-                urllib.request.urlopen(site, timeout=timeout)
-                end_time = time()
-                time_taken = end_time - start_time
-                verbose_print(verbose, f"Proxy {self.proxy} is valid, time taken: {time_taken}")
-                return True, time_taken, None
-            except Exception as e:
-                verbose_print(verbose, f"Proxy {self.proxy} is not valid, error: {str(e)}")
-                return False, 0, e
-        else:
-            url = self.method + "://" + self.proxy
-            proxy_support = urllib.request.ProxyHandler({self.method: url})
-            opener = urllib.request.build_opener(proxy_support)
-            urllib.request.install_opener(opener)
-            req = urllib.request.Request(self.method + "://" + site)
-            req.add_header("User-Agent", user_agent)
+    async def _tcp_alive(self, timeout=TCP_PROBE_TIMEOUT):
+        ip, _, port = self.proxy.partition(":")
+        for _ in range(3):
             try:
-                start_time = time()
-                urllib.request.urlopen(req, timeout=timeout)
-                end_time = time()
-                time_taken = end_time - start_time
-                verbose_print(verbose, f"Proxy {self.proxy} is valid, time taken: {time_taken}")
-                return True, time_taken, None
-            except Exception as e:
-                verbose_print(verbose, f"Proxy {self.proxy} is not valid, error: {str(e)}")
-                return False, 0, e
+                _, writer = await asyncio.wait_for(asyncio.open_connection(ip, int(port or 80)), timeout)
+                writer.close()
+                return True
+            except OSError as e:
+                if e.errno in (errno.EMFILE, errno.ENFILE):
+                    # Local fd exhaustion says nothing about the proxy;
+                    # back off and retry instead of declaring it dead.
+                    await asyncio.sleep(0.1)
+                    continue
+                return False
+            except Exception:
+                return False
+        # The probe never got to run; keep the proxy for the full check.
+        return True
+
+    async def check(self, site, timeout, user_agent, verbose):
+        if self.method in ["socks4", "socks5"]:
+            return await self._check_socks_proxy(site, timeout, user_agent, verbose)
+        return await self._check_http_proxy(site, timeout, user_agent, verbose)
+
+    async def _check_http_proxy(self, site, timeout, user_agent, verbose):
+        proxy_url = self.method + "://" + self.proxy
+        try:
+            start_time = time()
+            async with httpx.AsyncClient(http2=True, proxy=proxy_url, timeout=timeout,
+                                         verify=SSL_CONTEXT) as client:
+                response = await client.head(site, headers={"User-Agent": user_agent})
+                response.raise_for_status()
+            time_taken = time() - start_time
+            verbose_print(verbose, f"Proxy {self.proxy} is valid, time taken: {time_taken}")
+            return True, time_taken, None
+        except Exception as e:
+            verbose_print(verbose, f"Proxy {self.proxy} is not valid, error: {str(e)}")
+            return False, 0, e
+
+    async def _check_socks_proxy(self, site, timeout, user_agent, verbose):
+        connector = ProxyConnector.from_url(self.method + "://" + self.proxy, ttl_dns_cache=None,
+                                            ssl=SSL_CONTEXT)
+        try:
+            start_time = time()
+            async with aiohttp.ClientSession(connector=connector,
+                                             timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+                async with session.head(site, headers={"User-Agent": user_agent}) as response:
+                    response.raise_for_status()
+            time_taken = time() - start_time
+            verbose_print(verbose, f"Proxy {self.proxy} is valid, time taken: {time_taken}")
+            return True, time_taken, None
+        except Exception as e:
+            verbose_print(verbose, f"Proxy {self.proxy} is not valid, error: {str(e)}")
+            return False, 0, e
 
     def __str__(self):
         return self.proxy
@@ -66,39 +134,148 @@ def verbose_print(verbose, message):
         print(message)
 
 
-def check(file, timeout, method, site, verbose, random_user_agent):
-    proxies = []
+async def batch_alive(proxies, timeout=TCP_PROBE_TIMEOUT):
+    # Most scraped proxies are dead; a cheap TCP probe rejects them in ~1 RTT
+    # instead of waiting out the full HTTP timeout. The probes are plain
+    # non-blocking connects multiplexed on the event loop (epoll on Linux),
+    # so they can run at much higher concurrency than the full checks.
+    semaphore = asyncio.Semaphore(_max_probe_concurrency())
+
+    async def probe(proxy):
+        async with semaphore:
+            return proxy if await proxy._tcp_alive(timeout) else None
+
+    results = await asyncio.gather(*[probe(proxy) for proxy in proxies])
+    return [proxy for proxy in results if proxy is not None]
+
+
+async def _check_worker(queue, semaphore, state, site, timeout, verbose):
+    while True:
+        proxy, user_agent = await queue.get()
+        try:
+            async with semaphore:
+                valid, time_taken, error = await proxy.check(site, timeout, user_agent, verbose)
+            state["recent_conn_errors"].append(isinstance(error, (OSError, httpx.TransportError)))
+            state["progress"]["checked"] = next(state["checked_counter"])
+            if valid:
+                state["progress"]["valid"] += 1
+                state["valid_proxies"].append(proxy)
+        finally:
+            queue.task_done()
+
+
+async def _adjust_concurrency(semaphore, state):
+    # AIMD concurrency control: back off multiplicatively when the recent
+    # window shows a burst of connection-level errors (EMFILE, resets),
+    # then creep back up additively once things settle.
+    concurrency = state["concurrency"]
+    recent_conn_errors = state["recent_conn_errors"]
+    while True:
+        await asyncio.sleep(1)
+        if len(recent_conn_errors) < recent_conn_errors.maxlen:
+            continue
+        error_rate = sum(recent_conn_errors) / len(recent_conn_errors)
+        if error_rate > 0.25 and concurrency["limit"] > MIN_CONCURRENT_CHECKS:
+            shrink = min(concurrency["limit"] // 4, concurrency["limit"] - MIN_CONCURRENT_CHECKS)
+            concurrency["limit"] -= shrink
+            for _ in range(shrink):
+                await semaphore.acquire()
+        elif error_rate < 0.1 and concurrency["limit"] < MAX_CONCURRENT_CHECKS:
+            grow = min(CONCURRENCY_STEP, MAX_CONCURRENT_CHECKS - concurrency["limit"])
+            concurrency["limit"] += grow
+            for _ in range(grow):
+                semaphore.release()
+
+
+async def _report_progress(state, total):
+    # One print per second instead of one per completed check keeps
+    # stdout out of the hot path.
+    progress = state["progress"]
+    while True:
+        await asyncio.sleep(1)
+        print(f"Progress: {progress['checked']}/{total} checked ({progress['valid']} valid)")
+
+
+async def check_proxies(proxies, timeout, site, verbose, random_user_agent):
+    alive = await batch_alive(proxies)
+    verbose_print(verbose, f"{len(alive)}/{len(proxies)} proxies answered the TCP liveness probe")
+    proxies = alive
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+    if random_user_agent:
+        agents = random.choices(user_agents, k=len(proxies))
+    else:
+        agents = [random.choice(user_agents)] * len(proxies)
+
+    # Shared mutable state for the worker, controller and reporter tasks.
+    # itertools.count is a single C call, so progress needs no lock even if
+    # checks ever move off a single thread.
+    state = {
+        "checked_counter": itertools.count(1),
+        "progress": {"checked": 0, "valid": 0},
+        "concurrency": {"limit": MAX_CONCURRENT_CHECKS},
+        "recent_conn_errors": collections.deque(maxlen=100),
+        "valid_proxies": [],
+    }
+    total = len(proxies)
+
+    # Bounded producer/consumer: a fixed pool of worker tasks pulls from a
+    # small queue, so steady-state memory is O(workers) instead of one
+    # pending task (and its frame) per proxy in the list.
+    num_workers = min(len(proxies), MAX_CONCURRENT_CHECKS) or 1
+    queue = asyncio.Queue(maxsize=num_workers * 2)
+
+    workers = [asyncio.ensure_future(_check_worker(queue, semaphore, state, site, timeout, verbose))
+               for _ in range(num_workers)]
+    reporter = asyncio.ensure_future(_report_progress(state, total)) if verbose else None
+    controller = asyncio.ensure_future(_adjust_concurrency(semaphore, state))
+    try:
+        for item in zip(proxies, agents):
+            await queue.put(item)
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        controller.cancel()
+        if reporter is not None:
+            reporter.cancel()
+    return state["valid_proxies"]
+
+
+def _read_proxy_file(file):
     with open(file, "r") as f:
         for line in f:
-            proxies.append(Proxy(method, line.replace("\n", "")))
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
 
-    print(f"Checking {len(proxies)} proxies")
-    proxies = filter(lambda x: x.is_valid(), proxies)
-    valid_proxies = []
-    user_agent = random.choice(user_agents)
 
-    def check_proxy(proxy, user_agent):
-        new_user_agent = user_agent
-        if random_user_agent:
-            new_user_agent = random.choice(user_agents)
-        valid, time_taken, error = proxy.check(site, timeout, new_user_agent, verbose)
-        valid_proxies.extend([proxy] if valid else [])
+def load_proxies_from_file(file, method):
+    proxies = []
+    for line in _read_proxy_file(file):
+        proxy = Proxy.parse(method, line)
+        if proxy is not None:
+            proxies.append(proxy)
+    return proxies
+
 
-    threads = []
-    for proxy in proxies:
-        t = threading.Thread(target=check_proxy, args=(proxy, user_agent))
-        threads.append(t)
+def save_valid_proxies(file, valid_proxies):
+    # Sort on the cached numeric key: string sort would put 10.* before 2.*.
+    valid_proxies = sorted(valid_proxies, key=operator.attrgetter("_ip_int", "_port"))
+    with open(file, "w") as f:
+        f.writelines(str(proxy) + "\n" for proxy in valid_proxies)
 
-    for t in threads:
-        t.start()
 
-    for t in threads:
-        t.join()
+def check(file, timeout, method, site, verbose, random_user_agent):
+    # A bare hostname ("google.com") is a valid --site value; give it a
+    # scheme up front or every request would fail on an unparseable URL.
+    if "://" not in site:
+        site = (method if method in ("http", "https") else "http") + "://" + site
+    proxies = load_proxies_from_file(file, method)
 
-    with open(file, "w") as f:
-        for proxy in valid_proxies:
-            f.write(str(proxy) + "\n")
+    print(f"Checking {len(proxies)} proxies")
+    valid_proxies = asyncio.run(check_proxies(proxies, timeout, site, verbose, random_user_agent))
 
+    save_valid_proxies(file, valid_proxies)
     print(f"Found {len(valid_proxies)} valid proxies")
 
 
@@ -1,34 +1,353 @@
 import argparse
 import asyncio
-import platform
+import bisect
+import concurrent.futures
+import functools
+import hashlib
+import ipaddress
+import os
+import random
 import re
-import sys
+import socket
+import struct
 import time
+from urllib.parse import urlparse
+
+# httpx, orjson and selectolax are imported where they are first needed, so
+# --help and argument errors return before any of them is loaded.
+
+# One pass over the raw bytes: the dotted quad and port are captured as
+# groups and the 0-255 octet range is enforced by the pattern itself, so
+# candidates with out-of-range octets are rejected inside the C matching
+# engine and never reach Python at all.
+_OCTET = rb"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_PROXY_RE = re.compile(rb"(?<![\d.])(" + _OCTET + (rb"\." + _OCTET) * 3 + rb")(?::(\d{1,5}))?(?!\d)")
+# CDN and infrastructure ranges that never terminate user traffic; proxies
+# "hosted" there are artifacts of scraping CDN-fronted pages.
+BAD_IP_RANGES = [
+    # Cloudflare
+    "103.21.244.0/22",
+    "103.22.200.0/22",
+    "103.31.4.0/22",
+    "104.16.0.0/13",
+    "104.24.0.0/14",
+    "108.162.192.0/18",
+    "131.0.72.0/22",
+    "141.101.64.0/18",
+    "162.158.0.0/15",
+    "172.64.0.0/13",
+    "173.245.48.0/20",
+    "188.114.96.0/20",
+    "190.93.240.0/20",
+    "197.234.240.0/22",
+    "198.41.128.0/17",
+    # Fastly
+    "146.75.0.0/16",
+    "151.101.0.0/16",
+    # Amazon CloudFront
+    "13.32.0.0/15",
+    "13.224.0.0/14",
+    "99.84.0.0/16",
+    # Akamai
+    "23.32.0.0/11",
+    "104.64.0.0/10",
+]
+
+# Private, loopback, link-local, multicast and other non-routable blocks
+# (RFC 1918, RFC 5735, RFC 6598 and friends).
+RESERVED_IP_RANGES = [
+    "0.0.0.0/8",
+    "10.0.0.0/8",
+    "100.64.0.0/10",
+    "127.0.0.0/8",
+    "169.254.0.0/16",
+    "172.16.0.0/12",
+    "192.0.0.0/24",
+    "192.0.2.0/24",
+    "192.88.99.0/24",
+    "192.168.0.0/16",
+    "198.18.0.0/15",
+    "198.51.100.0/24",
+    "203.0.113.0/24",
+    "224.0.0.0/4",
+    "240.0.0.0/4",
+]
+
 
-import httpx
-from bs4 import BeautifulSoup
+def _build_deny_ranges():
+    # CDN and reserved blocks folded into one sorted table of inclusive
+    # (start, end) integers, with touching ranges merged, so the hot path
+    # is a single binary search with no ipaddress objects at all.
+    ranges = sorted((int(net.network_address), int(net.broadcast_address))
+                    for net in map(ipaddress.ip_network, BAD_IP_RANGES + RESERVED_IP_RANGES))
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        if start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return tuple(zip(*merged))
+
+
+_DENY_STARTS, _DENY_ENDS = _build_deny_ranges()
+
+# Bodies at least this large are worth shipping to a worker process.
+_FILTER_OFFLOAD_THRESHOLD = 1 << 18
+
+
+class _ConditionalCache:
+    """On-disk ETag/Last-Modified cache for sources with stable validators.
+
+    GitHub raw files return strong ETags; sending them back turns an
+    unchanged multi-MB download into an empty 304 and the cached body is
+    reused from disk.
+    """
+
+    def __init__(self, directory):
+        self._dir = directory
+        self._index = None
+
+    def _load(self):
+        import orjson
+        if self._index is None:
+            try:
+                with open(os.path.join(self._dir, "index.json"), "rb") as f:
+                    self._index = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                self._index = {}
+
+    def _body_path(self, url):
+        return os.path.join(self._dir, hashlib.sha1(url.encode()).hexdigest())
+
+    def validators(self, url):
+        self._load()
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers or None
+
+    def body(self, url):
+        try:
+            with open(self._body_path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url, response):
+        import orjson
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        self._load()
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            with open(self._body_path(url), "wb") as f:
+                f.write(response.content)
+            self._index[url] = {"etag": etag, "last_modified": last_modified}
+            with open(os.path.join(self._dir, "index.json"), "wb") as f:
+                f.write(orjson.dumps(self._index))
+        except OSError:
+            pass
+
+
+_response_cache = _ConditionalCache(os.path.join(os.path.expanduser("~"), ".cache", "proxy-scraper"))
+
+
+# The same CDN addresses recur across the aggregate lists, so memoize on
+# the integer form and each distinct IP pays for one bisect per run.
+@functools.lru_cache(maxsize=1 << 16)
+def _is_bad_ip_int(ip_int):
+    i = bisect.bisect_right(_DENY_STARTS, ip_int) - 1
+    return i >= 0 and ip_int <= _DENY_ENDS[i]
+
+
+def is_bad_ip(ip):
+    try:
+        return _is_bad_ip_int(struct.unpack("!I", socket.inet_aton(ip))[0])
+    except OSError:
+        return True
+
+
+def filter_proxies(proxy_text):
+    """Extract proxies, dropping malformed ones and CDN/reserved ranges.
+
+    Returns the surviving proxies as a set plus a small stats dict.
+    """
+    if isinstance(proxy_text, str):
+        proxy_text = proxy_text.encode()
+    valid_proxies = set()
+    # Duplicates are tracked as packed (ip << 16 | port) ints: identity
+    # hashing, ~6x smaller than the equivalent string set, and repeated
+    # candidates never reach the bad-range check or the string decode.
+    seen = set()
+    removed = 0
+    # Bind the hot callables to locals so each loop iteration does LOAD_FAST
+    # instead of a global plus attribute lookup per name.
+    add_valid = valid_proxies.add
+    add_seen = seen.add
+    is_bad = _is_bad_ip_int
+    unpack = struct.unpack
+    inet_aton = socket.inet_aton
+    for match in _PROXY_RE.finditer(proxy_text):
+        ip, port = match.groups()
+        if port is None:
+            port_int = 0
+        else:
+            port_int = int(port)
+            if not 1 <= port_int <= 65535:
+                removed += 1
+                continue
+        # inet_aton converts the whole dotted quad in one C call; the
+        # pattern already guarantees it is well-formed.
+        ip_int = unpack("!I", inet_aton(ip.decode()))[0]
+        key = (ip_int << 16) | port_int
+        if key in seen:
+            continue
+        add_seen(key)
+        if is_bad(ip_int):
+            removed += 1
+            continue
+        add_valid(match.group(0).decode())
+    return valid_proxies, {"kept": len(valid_proxies), "removed": removed}
 
 
 class Scraper:
 
+    RETRY_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 0.4
+    # Conditional requests only help sources whose validators are stable
+    # across fetches; subclasses opt in.
+    cacheable = False
+
     def __init__(self, method, _url):
         self.method = method
         self._url = _url
+        # Every template parameter is fixed at construction time, so resolve
+        # the URL (and its host, for per-domain reporting) once instead of
+        # re-parsing per call.
+        self._resolved_url = self._format_url()
+        self.domain = urlparse(self._resolved_url).netloc
 
-    def get_url(self, **kwargs):
+    def _format_url(self, **kwargs):
         return self._url.format(**kwargs, method=self.method)
 
+    def get_url(self):
+        return self._resolved_url
+
+    async def _retry_attempts(self):
+        # Pace the attempts with exponential backoff plus a little jitter,
+        # yielding whether the current attempt is the last one.
+        for attempt in range(self.RETRY_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(self.RETRY_BASE_DELAY * 2 ** (attempt - 1) + random.random() * 0.1)
+            yield attempt == self.RETRY_ATTEMPTS - 1
+
+    async def _request_with_retry(self, client, url, headers=None):
+        import httpx
+
+        # A transient failure (reset, 429, 5xx) on a high-yield source costs
+        # thousands of proxies, so retry before giving up on it.
+        response = None
+        async for last in self._retry_attempts():
+            try:
+                response = await client.get(url, headers=headers)
+            except httpx.TransportError:
+                if last:
+                    raise
+                continue
+            if response.status_code != 429 and response.status_code < 500:
+                break
+        return response
+
+    def _cached_response(self, url, response):
+        import httpx
+
+        if response.status_code == 304:
+            body = _response_cache.body(url)
+            if body is not None:
+                return httpx.Response(200, content=body)
+        elif response.status_code == 200:
+            _response_cache.store(url, response)
+        return response
+
     async def get_response(self, client):
-        return await client.get(self.get_url())
+        url = self.get_url()
+        conditional = _response_cache.validators(url) if self.cacheable else None
+        response = await self._request_with_retry(client, url, headers=conditional)
+        if self.cacheable and response is not None:
+            response = self._cached_response(url, response)
+        return response
 
     async def handle(self, response):
-        return response.text
-
-    async def scrape(self, client):
-        response = await self.get_response(client)
+        # Bytes, not text: filter_proxies scans them directly, so plain-text
+        # sources never pay for a decode of the whole body.
+        return response.content
+
+    async def _stream_once(self, client):
+        # For plain-text sources the body never needs to exist in one piece:
+        # pull 64 KiB chunks, filter every complete line as it arrives, and
+        # carry the trailing partial line into the next chunk. Returns None
+        # when the status is retryable so the caller takes another attempt.
+        proxies = set()
+        buffer = b""
+        async with client.stream("GET", self.get_url()) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                return None
+            # A branch, not raise_for_status: failing sources are routine
+            # here, and raising would build an exception and traceback per
+            # bad source only for the caller to swallow it.
+            if response.status_code >= 400:
+                return proxies
+            async for chunk in response.aiter_bytes(1 << 16):
+                buffer += chunk
+                cut = buffer.rfind(b"\n")
+                if cut == -1:
+                    continue
+                valid_proxies, _ = filter_proxies(buffer[:cut])
+                proxies |= valid_proxies
+                buffer = buffer[cut + 1:]
+        valid_proxies, _ = filter_proxies(buffer)
+        return proxies | valid_proxies
+
+    async def scrape_stream(self, client):
+        import httpx
+
+        # The streaming path carries the same retry policy as get_response:
+        # these are exactly the high-yield plain-text sources where a
+        # transient 429/5xx or a mid-stream read error costs the most.
+        result = None
+        async for last in self._retry_attempts():
+            try:
+                result = await self._stream_once(client)
+            except httpx.TransportError:
+                if last:
+                    raise
+                continue
+            if result is not None:
+                break
+        return result if result is not None else set()
+
+    async def scrape(self, client, response=None, executor=None):
+        if response is None:
+            response = await self.get_response(client)
+        if response.status_code >= 400:
+            return set()
         proxies = await self.handle(response)
-        pattern = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}(?::\d{1,5})?")
-        return re.findall(pattern, proxies)
+        # Filtering is pure CPU; big bodies go to the process pool so the
+        # event loop keeps servicing the other sources' network I/O. Small
+        # bodies are filtered inline — the IPC round trip would cost more.
+        if executor is not None and len(proxies) >= _FILTER_OFFLOAD_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            valid_proxies, _ = await loop.run_in_executor(executor, filter_proxies, proxies)
+        else:
+            valid_proxies, _ = filter_proxies(proxies)
+        return valid_proxies
 
 
 # From spys.me
@@ -37,11 +356,12 @@ class SpysMeScraper(Scraper):
     def __init__(self, method):
         super().__init__(method, "https://spys.me/{mode}.txt")
 
-    def get_url(self, **kwargs):
+    def _format_url(self, **kwargs):
         mode = "proxy" if self.method == "http" else "socks" if self.method == "socks" else "unknown"
         if mode == "unknown":
+            # Raised at construction now, not on first fetch.
             raise NotImplementedError
-        return super().get_url(mode=mode, **kwargs)
+        return super()._format_url(mode=mode, **kwargs)
 
 
 # From proxyscrape.com
@@ -56,11 +376,11 @@ class ProxyScrapeScraper(Scraper):
                          "&timeout={timout}"
                          "&country={country}")
 
-    def get_url(self, **kwargs):
-        return super().get_url(timout=self.timout, country=self.country, **kwargs)
+    def _format_url(self, **kwargs):
+        return super()._format_url(timout=self.timout, country=self.country, **kwargs)
 
 # From geonode.com - A little dirty, grab http(s) and socks but use just for socks
-class GeoNodeScraper(Scraper):
+class ProxyListApiScraper(Scraper):
 
     def __init__(self, method, limit="500", page="1", sort_by="lastChecked", sort_type="desc"):
         self.limit = limit
@@ -74,8 +394,25 @@ class GeoNodeScraper(Scraper):
                          "&sort_by={sort_by}"
                          "&sort_type={sort_type}")
 
-    def get_url(self, **kwargs):
-        return super().get_url(limit=self.limit, page=self.page, sort_by=self.sort_by, sort_type=self.sort_type, **kwargs)
+    def _format_url(self, **kwargs):
+        return super()._format_url(limit=self.limit, page=self.page, sort_by=self.sort_by, sort_type=self.sort_type, **kwargs)
+
+    async def handle(self, response):
+        import orjson
+
+        # orjson decodes the raw bytes directly, skipping both the UTF-8
+        # text pass and the stdlib decoder.
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return b""
+        proxies = set()
+        for entry in data.get("data", []):
+            ip = entry.get("ip")
+            port = entry.get("port")
+            if ip and port:
+                proxies.add(ip + ":" + str(port))
+        return "\n".join(proxies)
 
 # From proxy-list.download
 class ProxyListDownloadScraper(Scraper):
@@ -84,29 +421,86 @@ class ProxyListDownloadScraper(Scraper):
         self.anon = anon
         super().__init__(method, "https://www.proxy-list.download/api/v1/get?type={method}&anon={anon}")
 
-    def get_url(self, **kwargs):
-        return super().get_url(anon=self.anon, **kwargs)
+    def _format_url(self, **kwargs):
+        return super()._format_url(anon=self.anon, **kwargs)
+
+
+# From GitHub-hosted aggregate lists with protocol://ip:port lines
+class GitHubScraper(Scraper):
+
+    cacheable = True
+
+    def __init__(self, method, _url):
+        super().__init__(method, _url)
+        # Every scheme this method should accept, precomputed as bytes so
+        # the per-line test is a memcmp per prefix and nothing else.
+        if method == "http":
+            schemes = ("http", "https")
+        else:
+            schemes = (method,)
+        self._prefixes = tuple((scheme + "://").encode() for scheme in schemes)
+
+    async def handle(self, response):
+        # Stay on raw bytes: splitlines handles \r\n in one C-level scan and
+        # the body never pays a whole-text decode. Prefix dispatch cannot
+        # fire on comments the way the old substring test could; ip:port
+        # validation is left to the shared filter pass downstream.
+        prefixes = self._prefixes
+        proxies = set()
+        for line in response.content.splitlines():
+            for prefix in prefixes:
+                if line.startswith(prefix):
+                    proxies.add(line[len(prefix):].strip())
+                    break
+        # Stay in bytes: filter_proxies scans bytes anyway, so decoding here
+        # only to re-encode there would be two wasted passes.
+        return b"\n".join(proxies)
 
 
 # For websites using table in html
 class GeneralTableScraper(Scraper):
 
+    @staticmethod
+    def _parse(text):
+        from selectolax.parser import HTMLParser
+
+        # selectolax parses and walks the DOM in C; html.parser spends the
+        # same work in interpreted bytecode, one allocation per node.
+        tree = HTMLParser(text)
+        proxies = set()
+        table = tree.css_first("table.table.table-striped.table-bordered")
+        # Scope to tbody: the HTML5 tree builder always materializes it, and
+        # this keeps the header rows out of the candidate set entirely.
+        for row in table.css("tbody tr"):
+            cells = row.css("td")
+            if len(cells) >= 2:
+                proxies.add(cells[0].text(strip=True) + ":" + cells[1].text(strip=True))
+        return "\n".join(proxies)
+
     async def handle(self, response):
-        soup = BeautifulSoup(response.text, "html.parser")
+        # The parse is pure CPU; run it on a worker thread so the event
+        # loop keeps draining the other sources meanwhile.
+        return await asyncio.to_thread(self._parse, response.text)
+
+
+# For websites using div in html
+class GeneralDivScraper(Scraper):
+
+    @staticmethod
+    def _parse(text):
+        from selectolax.parser import HTMLParser
+        tree = HTMLParser(text)
         proxies = set()
-        table = soup.find("table", attrs={"class": "table table-striped table-bordered"})
-        for row in table.findAll("tr"):
-            count = 0
-            proxy = ""
-            for cell in row.findAll("td"):
-                if count == 1:
-                    proxy += ":" + cell.text.replace("&nbsp;", "")
-                    proxies.add(proxy)
-                    break
-                proxy += cell.text.replace("&nbsp;", "")
-                count += 1
+        table = tree.css_first("div.list")
+        for row in table.css("div"):
+            cells = row.css("div.td")
+            if len(cells) >= 2:
+                proxies.add(cells[0].text(strip=True) + ":" + cells[1].text(strip=True))
         return "\n".join(proxies)
 
+    async def handle(self, response):
+        return await asyncio.to_thread(self._parse, response.text)
+
 
 scrapers = [
     SpysMeScraper("http"),
@@ -114,7 +508,7 @@ scrapers = [
     ProxyScrapeScraper("http"),
     ProxyScrapeScraper("socks4"),
     ProxyScrapeScraper("socks5"),
-    GeoNodeScraper("socks"),
+    ProxyListApiScraper("socks"),
     ProxyListDownloadScraper("https", "elite"),
     ProxyListDownloadScraper("http", "elite"),
     ProxyListDownloadScraper("http", "transparent"),
@@ -123,12 +517,112 @@ scrapers = [
     GeneralTableScraper("http", "http://free-proxy-list.net"),
     GeneralTableScraper("http", "http://us-proxy.org"),
     GeneralTableScraper("socks", "http://socks-proxy.net"),
+    GeneralDivScraper("http", "https://freeproxy.world"),
+    GitHubScraper("http", "https://raw.githubusercontent.com/proxifly/free-proxy-list/main/proxies/all/data.txt"),
+    GitHubScraper("socks4", "https://raw.githubusercontent.com/proxifly/free-proxy-list/main/proxies/all/data.txt"),
+    GitHubScraper("socks5", "https://raw.githubusercontent.com/proxifly/free-proxy-list/main/proxies/all/data.txt"),
+    GitHubScraper("http", "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/all.txt"),
+    GitHubScraper("socks4", "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/all.txt"),
+    GitHubScraper("socks5", "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/all.txt"),
 ]
 
 
-def verbose_print(verbose, message):
+def _proxy_sort_key(proxy):
+    # Numeric (ip, port) key: string order would put 10.* before 2.*.
+    ip, _, port = proxy.partition(":")
+    return struct.unpack("!I", socket.inet_aton(ip))[0], int(port or 0)
+
+
+def verbose_print(verbose, message, *args):
+    # %-style args are formatted only after the verbosity check, like lazy
+    # logging calls, so quiet runs never pay for building the strings.
     if verbose:
-        print(message)
+        print(message % args if args else message)
+
+
+def _install_dns_cache():
+    """Cache getaddrinfo results for the lifetime of the process.
+
+    The source list spans only a handful of hostnames, but httpx resolves
+    through the loop's getaddrinfo whenever it opens a fresh connection, and
+    the OS resolver is not guaranteed to cache. A scrape run is far shorter
+    than any sane DNS TTL, so one answer per host is enough.
+    """
+    resolve = socket.getaddrinfo
+    cached = functools.lru_cache(maxsize=256)(resolve)
+
+    # The event loop passes type= as a keyword, so the parameter has to keep
+    # the stdlib's builtin-shadowing name.
+    def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):  # noqa: A002
+        try:
+            return cached(host, port, family, type, proto, flags)
+        except TypeError:
+            return resolve(host, port, family, type, proto, flags)
+
+    socket.getaddrinfo = getaddrinfo
+
+
+def _create_http_client_config():
+    """Shared settings for the one AsyncClient used by every source."""
+    import httpx
+    limits = httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=60.0)
+    return {
+        "follow_redirects": True,
+        "timeout": httpx.Timeout(30.0, connect=10.0),
+        # HTTP/2 lets requests against the same origin multiplex over one
+        # TLS connection, and transport-level retries absorb flaky sources.
+        "transport": httpx.AsyncHTTPTransport(retries=2, http2=True, limits=limits),
+    }
+
+
+_client = None
+
+
+def get_client():
+    """Build the shared AsyncClient lazily and reuse it across scrape() calls.
+
+    Recreating the client per call would rebuild the pool and TLS contexts
+    and throw away every warm connection.
+    """
+    import httpx
+    global _client
+    if _client is None:
+        _install_dns_cache()
+        _client = httpx.AsyncClient(**_create_http_client_config())
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _scrape_source(url, url_scrapers, client, executor, proxies,
+                         host_semaphores, source_semaphore, verbose):
+    # Each scraper's result is folded into the shared set immediately:
+    # duplicates from the aggregate lists collapse on the fly and the
+    # per-source results are freed while slower sources are still in
+    # flight, so peak memory tracks unique proxies only.
+    try:
+        async with source_semaphore:
+            verbose_print(verbose, "Looking %s...", url)
+            host = url_scrapers[0].domain
+            semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(4))
+            # A lone scraper on the default (pass-through) handle can
+            # stream the body straight into the filter with bounded
+            # memory; shared or custom handles need the whole body.
+            if len(url_scrapers) == 1 and type(url_scrapers[0]).handle is Scraper.handle:
+                async with semaphore:
+                    proxies.update(await url_scrapers[0].scrape_stream(client))
+                return
+            async with semaphore:
+                response = await url_scrapers[0].get_response(client)
+            for scraper in url_scrapers:
+                proxies.update(await scraper.scrape(client, response, executor))
+    except Exception as exc:
+        verbose_print(verbose, "Scraping %s failed: %s", url, exc)
 
 
 async def scrape(method, output, verbose):
@@ -140,29 +634,48 @@ async def scrape(method, output, verbose):
     if not proxy_scrapers:
         raise ValueError("Method not supported")
     verbose_print(verbose, "Scraping proxies...")
-    proxies = []
+    proxies = set()
 
-    tasks = []
-    client = httpx.AsyncClient(follow_redirects=True)
-
-    async def scrape_scraper(scraper):
-        try:
-            verbose_print(verbose, f"Looking {scraper.get_url()}...")
-            proxies.extend(await scraper.scrape(client))
-        except Exception:
-            pass
+    client = get_client()
 
+    # Several scrapers (one per method) read the same aggregate list; group
+    # them by URL so each body is fetched once and dispatched to every
+    # scraper's handle.
+    scrapers_by_url = {}
     for scraper in proxy_scrapers:
-        tasks.append(asyncio.ensure_future(scrape_scraper(scraper)))
+        scrapers_by_url.setdefault(scraper.get_url(), []).append(scraper)
+
+    # At most a few in-flight requests per origin: the GitHub raw URLs all
+    # share one host, and queueing them lets HTTP/2 multiplex on the kept-
+    # alive connection instead of opening a burst of parallel TLS sessions.
+    host_semaphores = {}
+    # And one global bound well under the pool's max_connections, so a large
+    # source list ramps up smoothly instead of bursting every connect and
+    # DNS lookup into the loop at once.
+    source_semaphore = asyncio.Semaphore(32)
+
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        for completed in asyncio.as_completed(
+                [_scrape_source(url, url_scrapers, client, executor, proxies,
+                                host_semaphores, source_semaphore, verbose)
+                 for url, url_scrapers in scrapers_by_url.items()]):
+            await completed
+
+    verbose_print(verbose, "Writing %d proxies to file...", len(proxies))
+    # Binary mode skips the text layer's encode pass; writelines over a
+    # generator streams through a 1 MiB buffer instead of materializing the
+    # whole payload as one joined string first.
+    with open(output, "wb", buffering=1 << 20) as f:
+        f.writelines(proxy.encode("ascii") + b"\n" for proxy in sorted(proxies, key=_proxy_sort_key))
+    verbose_print(verbose, "Done!")
+    verbose_print(verbose, "Took %s seconds", time.time() - now)
 
-    await asyncio.gather(*tasks)
-    await client.aclose()
 
-    verbose_print(verbose, f"Writing {len(proxies)} proxies to file...")
-    with open(output, "w") as f:
-        f.write("\n".join(proxies))
-    verbose_print(verbose, "Done!")
-    verbose_print(verbose, f"Took {time.time() - now} seconds")
+async def _run_cli(proxy, output, verbose):
+    try:
+        await scrape(proxy, output, verbose)
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
@@ -187,13 +700,12 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
-    if sys.version_info >= (3, 7) and platform.system() == 'Windows':
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(scrape(args.proxy, args.output, args.verbose))
-        loop.close()
-    elif sys.version_info >= (3, 7):
-        asyncio.run(scrape(args.proxy, args.output, args.verbose))
-    else:
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(scrape(args.proxy, args.output, args.verbose))
-        loop.close()
+    # libuv's transports cut per-syscall overhead on the many small reads a
+    # scrape run does; purely optional, and absent on Windows.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    asyncio.run(_run_cli(args.proxy, args.output, args.verbose))